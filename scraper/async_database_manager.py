@@ -0,0 +1,144 @@
+import asyncio
+from typing import List, Dict, AsyncIterator
+
+from database_manager import DatabaseManager, InternshipScraperWithDB
+
+
+class AsyncDatabaseManager:
+    """
+    asyncio-native wrapper around DatabaseManager.
+    The supabase client is blocking, so each call runs in a worker thread
+    and independent calls can be awaited concurrently.
+    """
+
+    def __init__(self, db: DatabaseManager = None):
+        self.db = db or DatabaseManager()
+
+    def generate_record_hash(self, internship: Dict) -> str:
+        """Pure computation, no round-trip needed"""
+        return self.db.generate_record_hash(internship)
+
+    async def bulk_upsert_internships(self, internships: List[Dict], current_time: str = None) -> bool:
+        return await asyncio.to_thread(self.db.bulk_upsert_internships, internships, current_time)
+
+    async def mark_stale_records(self, seen_at: str) -> bool:
+        return await asyncio.to_thread(self.db.mark_stale_records, seen_at)
+
+    async def get_active_internships(self, filters: Dict = None) -> List[Dict]:
+        return await asyncio.to_thread(self.db.get_active_internships, filters)
+
+    async def iter_active_internships(self, columns: List[str] = None, filters: Dict = None,
+                                      changed_since=None, page_size: int = 500,
+                                      active_only: bool = True) -> AsyncIterator[Dict]:
+        """Async counterpart of DatabaseManager.iter_active_internships"""
+        if page_size <= 0:
+            raise ValueError(f"page_size must be positive, got {page_size}")
+
+        after_id = None
+        while True:
+            rows = await asyncio.to_thread(self.db.fetch_internships_page, columns, filters,
+                                           changed_since, after_id, page_size, active_only)
+
+            # Only an empty page ends the stream, the server may cap page_size
+            if not rows:
+                return
+
+            for row in rows:
+                yield row
+            after_id = rows[-1]['id']
+
+    async def get_stats(self) -> Dict:
+        return await asyncio.to_thread(self.db.get_stats)
+
+    async def log_scrape_start(self) -> str:
+        return await asyncio.to_thread(self.db.log_scrape_start)
+
+    async def log_scrape_completion(self, log_id: str, stats: Dict, success: bool = True) -> bool:
+        return await asyncio.to_thread(self.db.log_scrape_completion, log_id, stats, success)
+
+
+class AsyncInternshipScraperWithDB(InternshipScraperWithDB):
+    """
+    Scraper whose scrape-and-sync pipeline overlaps independent stages:
+      - log_scrape_start runs while the README is fetched and parsed
+      - the change feed delta is computed while the database sync is in flight
+      - after a successful sync, the JSON export, change feed commit, stats
+        and completion log run together
+    so a tick costs roughly the critical path instead of the sum of all stages.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.async_db = AsyncDatabaseManager(self.db)
+
+    async def async_sync_to_database(self, internships: List[Dict]) -> bool:
+        """Run the regular sync (upsert then mark stale) off the event loop"""
+        return await asyncio.to_thread(self.sync_to_database, internships)
+
+    async def async_scrape_and_sync(self):
+        """Main method: scrape and sync to database with overlapping stages"""
+        log_task = asyncio.create_task(self.async_db.log_scrape_start())
+        log_id = None
+        try:
+            # Scrape while the start log is being written
+            internships = await asyncio.to_thread(self.scrape)
+            log_id = await log_task
+
+            if not internships:
+                print("No internships found to sync")
+                if log_id:
+                    await self.async_db.log_scrape_completion(log_id, {'total_found': 0}, success=False)
+                return False
+
+            # Compute the change feed delta while syncing to the database
+            success, delta = await asyncio.gather(
+                self.async_sync_to_database(internships),
+                asyncio.to_thread(self.compute_changes, internships)
+            )
+
+            if success:
+                completion = self.completion_stats(internships, delta)
+
+                # Like the sync path, only export and commit the change feed once
+                # the DB sync succeeded; these, stats and the completion log are
+                # independent of each other
+                log_coro = self.async_db.log_scrape_completion(log_id, completion) if log_id else asyncio.sleep(0)
+                _, _, stats, _ = await asyncio.gather(
+                    asyncio.to_thread(self.export_json),
+                    asyncio.to_thread(self.commit_changes, delta),
+                    self.async_db.get_stats(),
+                    log_coro
+                )
+
+                print(f"Database sync complete. Total active: {stats.get('total_active', 'unknown')}")
+                print(f"Freshman-friendly: {stats.get('freshman_friendly_count', 0)}")
+
+            return success
+
+        except Exception as e:
+            print(f"Scrape and sync error: {e}")
+            if log_id is None:
+                # log_scrape_start swallows its own errors, so this never raises
+                log_id = await log_task
+            if log_id:
+                await self.async_db.log_scrape_completion(log_id, {'error': str(e)}, success=False)
+            return False
+
+    def scrape_and_sync(self):
+        """
+        Blocking entry point for callers that are not already in an event loop.
+        Inside a running loop, await async_scrape_and_sync() instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.async_scrape_and_sync())
+        raise RuntimeError("scrape_and_sync() called from a running event loop; "
+                           "await async_scrape_and_sync() instead")
+
+
+# Usage for production
+if __name__ == "__main__":
+    scraper = AsyncInternshipScraperWithDB()
+    scraper.scrape_and_sync()
+    scraper.close()
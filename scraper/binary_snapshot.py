@@ -0,0 +1,320 @@
+import mmap
+import os
+import struct
+from typing import List, Dict, Iterator, Optional
+
+# File layout (little-endian):
+#   header
+#   record table      - fixed-width RECORD rows
+#   category table    - u32 string id per category id
+#   location refs     - u32 string ids, sliced by each record's loc_start/loc_count
+#   string offsets    - u32 * (string_count + 1) into the string data
+#   string data       - utf-8, deduplicated
+MAGIC = b'ITSNAP\x00\x01'
+HEADER = struct.Struct('<8sIIIIIIIIII')
+RECORD = struct.Struct('<IIIIIHBB')
+U32 = struct.Struct('<I')
+NO_STRING = 0xFFFFFFFF
+
+# Bit flags packed into each record
+REQUIRES_CITIZENSHIP = 1
+NO_SPONSORSHIP = 2
+IS_SUBSIDIARY = 4
+FRESHMAN_FRIENDLY = 8
+
+# Byte offsets of category id and flags inside a RECORD row
+_CATEGORY_BYTE = RECORD.size - 2
+_FLAGS_BYTE = RECORD.size - 1
+
+
+def write_snapshot(data: Dict, filename: str):
+    """
+    Write the export_json payload as a compact binary snapshot.
+    Written to a temp file and renamed so open readers keep their old mapping.
+    """
+    internships = data['internships']
+    strings = {}
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        if value not in strings:
+            strings[value] = len(strings)
+        return strings[value]
+
+    categories = sorted({i['category'] for i in internships})
+    if len(categories) > 255:
+        raise ValueError("Too many categories for a one-byte category id")
+    category_ids = {name: index for index, name in enumerate(categories)}
+    category_refs = [intern(name) for name in categories]
+
+    records = bytearray()
+    location_refs = []
+    for internship in internships:
+        flags = (
+            (REQUIRES_CITIZENSHIP if internship.get('requires_citizenship') else 0)
+            | (NO_SPONSORSHIP if internship.get('no_sponsorship') else 0)
+            | (IS_SUBSIDIARY if internship.get('is_subsidiary') else 0)
+            | (FRESHMAN_FRIENDLY if internship.get('is_freshman_friendly') else 0)
+        )
+        locations = internship.get('locations') or []
+        records += RECORD.pack(
+            intern(internship['company']),
+            intern(internship['role']),
+            intern(internship.get('application_link')),
+            intern(internship.get('date_posted')),
+            len(location_refs),
+            len(locations),
+            category_ids[internship['category']],
+            flags
+        )
+        location_refs.extend(intern(location) for location in locations)
+
+    last_updated = intern(data.get('last_updated'))
+
+    encoded = [value.encode('utf-8') for value in strings]
+    string_offsets = [0]
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+
+    records_offset = HEADER.size
+    categories_offset = records_offset + len(records)
+    location_refs_offset = categories_offset + U32.size * len(category_refs)
+    string_offsets_offset = location_refs_offset + U32.size * len(location_refs)
+    string_data_offset = string_offsets_offset + U32.size * len(string_offsets)
+
+    header = HEADER.pack(
+        MAGIC, len(internships), len(categories), len(location_refs), len(strings), last_updated,
+        records_offset, categories_offset, location_refs_offset, string_offsets_offset, string_data_offset
+    )
+
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, 'wb') as f:
+        f.write(header)
+        f.write(records)
+        f.write(struct.pack(f'<{len(category_refs)}I', *category_refs))
+        f.write(struct.pack(f'<{len(location_refs)}I', *location_refs))
+        f.write(struct.pack(f'<{len(string_offsets)}I', *string_offsets))
+        f.write(b''.join(encoded))
+    os.replace(tmp_filename, filename)
+
+
+class RecordView:
+    """Lazy view of one record; fields are decoded from the mapping on access"""
+
+    __slots__ = ('_reader', '_offset')
+
+    def __init__(self, reader: 'SnapshotReader', index: int):
+        self._reader = reader
+        self._offset = reader._records_offset + index * RECORD.size
+
+    def _field(self, position: int) -> int:
+        return U32.unpack_from(self._reader._mm, self._offset + position * U32.size)[0]
+
+    @property
+    def company(self) -> str:
+        return self._reader.string(self._field(0))
+
+    @property
+    def role(self) -> str:
+        return self._reader.string(self._field(1))
+
+    @property
+    def application_link(self) -> Optional[str]:
+        return self._reader.string(self._field(2))
+
+    @property
+    def date_posted(self) -> Optional[str]:
+        return self._reader.string(self._field(3))
+
+    @property
+    def locations(self) -> List[str]:
+        _, _, _, _, start, count, _, _ = RECORD.unpack_from(self._reader._mm, self._offset)
+        return [self._reader.string(string_id) for string_id in self._reader._location_ids(start, count)]
+
+    @property
+    def category(self) -> str:
+        return self._reader.categories[self._reader._mm[self._offset + _CATEGORY_BYTE]]
+
+    @property
+    def flags(self) -> int:
+        return self._reader._mm[self._offset + _FLAGS_BYTE]
+
+    @property
+    def requires_citizenship(self) -> bool:
+        return bool(self.flags & REQUIRES_CITIZENSHIP)
+
+    @property
+    def no_sponsorship(self) -> bool:
+        return bool(self.flags & NO_SPONSORSHIP)
+
+    @property
+    def is_subsidiary(self) -> bool:
+        return bool(self.flags & IS_SUBSIDIARY)
+
+    @property
+    def is_freshman_friendly(self) -> bool:
+        return bool(self.flags & FRESHMAN_FRIENDLY)
+
+    def to_dict(self) -> Dict:
+        """Materialize the record in the same shape as internships.json"""
+        return {
+            'company': self.company,
+            'role': self.role,
+            'category': self.category,
+            'locations': self.locations,
+            'application_link': self.application_link,
+            'date_posted': self.date_posted,
+            'requires_citizenship': self.requires_citizenship,
+            'no_sponsorship': self.no_sponsorship,
+            'is_subsidiary': self.is_subsidiary,
+            'is_freshman_friendly': self.is_freshman_friendly
+        }
+
+
+class SnapshotReader:
+    """
+    Memory-mapped reader for snapshots written by write_snapshot.
+    Only the header and category names are decoded up front.
+    """
+
+    def __init__(self, filename: str):
+        self._file = open(filename, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, self._count, category_count, _, self._string_count, last_updated,
+         self._records_offset, categories_offset, self._location_refs_offset,
+         self._string_offsets_offset, self._string_data_offset) = HEADER.unpack_from(self._mm, 0)
+
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{filename} is not an internship snapshot")
+
+        self.last_updated = self.string(last_updated)
+        self.categories = [self.string(string_id)
+                           for string_id in struct.unpack_from(f'<{category_count}I', self._mm, categories_offset)]
+
+    def string(self, string_id: int) -> Optional[str]:
+        if string_id == NO_STRING:
+            return None
+        start, end = struct.unpack_from('<II', self._mm, self._string_offsets_offset + string_id * U32.size)
+        return self._mm[self._string_data_offset + start:self._string_data_offset + end].decode('utf-8')
+
+    def _location_ids(self, start: int, count: int):
+        return struct.unpack_from(f'<{count}I', self._mm, self._location_refs_offset + start * U32.size)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> RecordView:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return RecordView(self, index)
+
+    def __iter__(self) -> Iterator[RecordView]:
+        for index in range(self._count):
+            yield RecordView(self, index)
+
+    def filter(self, category: str = None, sponsorship_ok: bool = None,
+               freshman_friendly: bool = None, no_citizenship_required: bool = None) -> Iterator[RecordView]:
+        """
+        Iterate records matching the filters, checking only the category byte
+        and flag bits of each row; strings are never decoded for rejected rows.
+        """
+        category_id = None
+        if category and category != 'All':
+            if category not in self.categories:
+                return
+            category_id = self.categories.index(category)
+
+        required, forbidden = 0, 0
+        if sponsorship_ok:
+            forbidden |= NO_SPONSORSHIP
+        if no_citizenship_required:
+            forbidden |= REQUIRES_CITIZENSHIP
+        if freshman_friendly is True:
+            required |= FRESHMAN_FRIENDLY
+        elif freshman_friendly is False:
+            forbidden |= FRESHMAN_FRIENDLY
+
+        mm = self._mm
+        offset = self._records_offset
+        for index in range(self._count):
+            flags = mm[offset + _FLAGS_BYTE]
+            if (category_id is None or mm[offset + _CATEGORY_BYTE] == category_id) \
+                    and flags & required == required and not flags & forbidden:
+                yield RecordView(self, index)
+            offset += RECORD.size
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _measure(kind: str, filename: str):
+    """Child process: load one format and report wall time and peak RSS growth"""
+    import json
+    import resource
+    import time
+
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if kind == 'json':
+        with open(filename, encoding='utf-8') as f:
+            data = json.load(f)
+        freshman = sum(1 for i in data['internships'] if i.get('is_freshman_friendly'))
+    else:
+        reader = SnapshotReader(filename)
+        freshman = sum(1 for _ in reader.filter(freshman_friendly=True))
+    elapsed = time.perf_counter() - start
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss
+    print(f"{elapsed * 1000:.2f} {rss_kb} {freshman}")
+
+
+def benchmark(json_filename: str, scale: int = 1, runs: int = 5):
+    """Compare cold load of the JSON export and the binary snapshot in fresh processes"""
+    import json
+    import subprocess
+    import sys
+    import tempfile
+
+    with open(json_filename, encoding='utf-8') as f:
+        data = json.load(f)
+    data['internships'] = data['internships'] * scale
+
+    with tempfile.TemporaryDirectory() as workdir:
+        json_path = os.path.join(workdir, 'internships.json')
+        bin_path = os.path.join(workdir, 'internships.bin')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        write_snapshot(data, bin_path)
+
+        print(f"{len(data['internships'])} records, JSON {os.path.getsize(json_path) // 1024} KiB, "
+              f"snapshot {os.path.getsize(bin_path) // 1024} KiB")
+        for kind, path in (('json', json_path), ('bin', bin_path)):
+            timings, rss = [], []
+            for _ in range(runs):
+                output = subprocess.run([sys.executable, __file__, '--measure', kind, path],
+                                        capture_output=True, text=True, check=True).stdout.split()
+                timings.append(float(output[0]))
+                rss.append(int(output[1]))
+            print(f"{kind:>4}: load+filter {min(timings):.2f} ms (best of {runs}), peak RSS +{max(rss)} KiB")
+
+
+# Usage: python binary_snapshot.py [internships.json] [scale]
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--measure':
+        _measure(sys.argv[2], sys.argv[3])
+    else:
+        source = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), 'internships.json')
+        benchmark(source, int(sys.argv[2]) if len(sys.argv) > 2 else 1)
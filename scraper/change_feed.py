@@ -0,0 +1,297 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Callable
+
+import requests
+
+from location_normalizer import location_keys, index_key, resolve_location_query
+
+
+class WebhookDispatcher:
+    """
+    Fan-out of webhook POSTs through a bounded queue and a fixed worker pool.
+    submit() blocks while the queue is full so a slow endpoint applies
+    backpressure instead of growing memory without limit.
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 100, timeout: int = 10):
+        self.timeout = timeout
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.workers = []
+        for _ in range(workers):
+            worker = threading.Thread(target=self._work, daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def _work(self):
+        while True:
+            url, payload = self.queue.get()
+            try:
+                response = requests.post(url, json=payload, timeout=self.timeout)
+                response.raise_for_status()
+            except Exception as e:
+                print(f"Webhook delivery to {url} failed: {e}")
+            finally:
+                self.queue.task_done()
+
+    def submit(self, url: str, payload: Dict):
+        self.queue.put((url, payload))
+
+    def drain(self):
+        """Block until every queued delivery has been attempted"""
+        self.queue.join()
+
+
+class ChangeFeed:
+    """
+    Append-only feed of new/closed/changed internships computed per scrape run.
+    The last seen snapshot, the feed itself and user filter subscriptions live
+    in a local SQLite file; matching subscriptions are notified by webhook.
+    
+    The file must persist between runs (set CHANGE_FEED_DB to a path on a
+    persistent volume in containers). Without it the next run bootstraps a new
+    baseline and sends no notifications for that run.
+    """
+
+    def __init__(self, identity: Callable[[Dict], str], fingerprint: Callable[[Dict], str],
+                 db_path=None, webhook_workers: int = 4, webhook_queue_size: int = 100):
+        self.identity = identity
+        self.fingerprint = fingerprint
+        self.db_path = str(db_path or os.getenv('CHANGE_FEED_DB') or Path(__file__).parent / 'change_feed.db')
+        self.webhook_workers = webhook_workers
+        self.webhook_queue_size = webhook_queue_size
+        self._dispatcher = None
+        self._init_schema()
+
+    @contextmanager
+    def _connect(self):
+        """
+        One connection per call so publish() can run from a worker thread.
+        Commits (or rolls back) the block and always closes the connection;
+        sqlite3's own context manager only does the former.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS snapshot (
+                    id TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    record TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_at TEXT NOT NULL,
+                    change_type TEXT NOT NULL,
+                    internship_id TEXT NOT NULL,
+                    record TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS subscriptions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    filters TEXT NOT NULL,
+                    webhook_url TEXT
+                );
+            """)
+
+    @property
+    def dispatcher(self) -> WebhookDispatcher:
+        """Worker pool is only started once there is something to deliver"""
+        if self._dispatcher is None:
+            self._dispatcher = WebhookDispatcher(self.webhook_workers, self.webhook_queue_size)
+        return self._dispatcher
+
+    def compute_delta(self, internships: List[Dict]) -> Dict[str, List[Dict]]:
+        """Diff the current scrape against the stored snapshot by record hash"""
+        current = {}
+        for internship in internships:
+            record_id = self.identity(internship)
+            if record_id not in current:
+                current[record_id] = dict(internship, id=record_id)
+
+        with self._connect() as conn:
+            previous = {row[0]: (row[1], row[2]) for row in conn.execute('SELECT id, fingerprint, record FROM snapshot')}
+
+        delta = {'new': [], 'closed': [], 'changed': []}
+        for record_id, record in current.items():
+            if record_id not in previous:
+                delta['new'].append(record)
+            elif previous[record_id][0] != self.fingerprint(record):
+                delta['changed'].append(record)
+
+        for record_id, (_, record) in previous.items():
+            if record_id not in current:
+                delta['closed'].append(json.loads(record))
+
+        delta['current'] = list(current.values())
+        return delta
+
+    def publish(self, internships: List[Dict]) -> Dict[str, List[Dict]]:
+        """Compute and commit this run's delta in one go. Returns the delta."""
+        return self.commit(self.compute_delta(internships))
+
+    def commit(self, delta: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """
+        Append a delta from compute_delta to the feed, replace the snapshot
+        and notify matching subscriptions. Call only once the run's data is
+        known to be stored, otherwise the next run would see no delta.
+        """
+        delta = dict(delta)
+        current = delta.pop('current')
+        run_at = datetime.now().isoformat()
+
+        with self._connect() as conn:
+            bootstrap = conn.execute('SELECT COUNT(*) FROM snapshot').fetchone()[0] == 0
+
+            conn.executemany(
+                'INSERT INTO changes (run_at, change_type, internship_id, record) VALUES (?, ?, ?, ?)',
+                [(run_at, change_type, record['id'], json.dumps(record, ensure_ascii=False))
+                 for change_type, records in delta.items() for record in records]
+            )
+            conn.execute('DELETE FROM snapshot')
+            conn.executemany(
+                'INSERT INTO snapshot (id, fingerprint, record) VALUES (?, ?, ?)',
+                [(record['id'], self.fingerprint(record), json.dumps(record, ensure_ascii=False))
+                 for record in current]
+            )
+
+        print(f"Change feed: {len(delta['new'])} new, {len(delta['closed'])} closed, {len(delta['changed'])} changed")
+
+        if bootstrap:
+            # First run only establishes the baseline; don't announce the whole list
+            print(f"Change feed bootstrapped at {self.db_path}, skipping notifications "
+                  f"(keep this file between runs or set CHANGE_FEED_DB)")
+        else:
+            self.notify(run_at, delta)
+
+        return delta
+
+    def read_changes(self, since_seq: int = 0, limit: int = 1000) -> List[Dict]:
+        """Read feed entries after a sequence number, oldest first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT seq, run_at, change_type, record FROM changes WHERE seq > ? ORDER BY seq LIMIT ?',
+                (since_seq, limit)
+            ).fetchall()
+        return [{'seq': seq, 'run_at': run_at, 'type': change_type, 'internship': json.loads(record)}
+                for seq, run_at, change_type, record in rows]
+
+    def subscribe(self, user_id: str, filters: Dict, webhook_url: str = None) -> int:
+        """
+        Register a filter subscription. Filters use the same keys as
+        DatabaseManager.get_active_internships, plus optional 'change_types'.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT INTO subscriptions (user_id, filters, webhook_url) VALUES (?, ?, ?)',
+                (user_id, json.dumps(filters, sort_keys=True), webhook_url)
+            )
+            return cursor.lastrowid
+
+    def unsubscribe(self, subscription_id: int) -> bool:
+        with self._connect() as conn:
+            return conn.execute('DELETE FROM subscriptions WHERE id = ?', (subscription_id,)).rowcount > 0
+
+    def _location_keys(self, record: Dict) -> set:
+        keys = set()
+        for display in record.get('locations', []):
+            keys |= location_keys(display)
+        return keys
+
+    def _filter_matcher(self, filters: Dict) -> Callable[[str, Dict, set], bool]:
+        """Compile a subscription filter into a predicate over (change_type, record, location keys)"""
+        change_types = set(filters.get('change_types') or ['new', 'changed'])
+        wanted_keys, location_text = None, None
+        if filters.get('location'):
+            resolved = resolve_location_query(filters['location'])
+            if resolved is None:
+                # Same text-match fallback as get_filtered_data
+                location_text = filters['location'].lower()
+            else:
+                wanted_keys = {index_key(key) for key in resolved}
+
+        def matches(change_type: str, record: Dict, record_location_keys: set) -> bool:
+            if change_type not in change_types:
+                return False
+            if filters.get('category') and filters['category'] != 'All' and record.get('category') != filters['category']:
+                return False
+            if filters.get('no_citizenship_required') and record.get('requires_citizenship'):
+                return False
+            if filters.get('sponsorship_available') and record.get('no_sponsorship'):
+                return False
+            if filters.get('freshman_friendly') and not record.get('is_freshman_friendly'):
+                return False
+            if wanted_keys is not None and not (wanted_keys & record_location_keys):
+                return False
+            if location_text is not None and not any(location_text in loc.lower()
+                                                     for loc in record.get('locations', [])):
+                return False
+            return True
+
+        return matches
+
+    def match_subscriptions(self, delta: Dict[str, List[Dict]]) -> Dict[int, Dict]:
+        """
+        Match every subscription against the delta in one pass.
+        Identical filters are compiled and evaluated once and shared by all
+        their subscribers, and each record's location keys are computed once.
+        """
+        with self._connect() as conn:
+            subscriptions = conn.execute('SELECT id, user_id, filters, webhook_url FROM subscriptions').fetchall()
+
+        subscribers_by_filter = {}
+        for subscription in subscriptions:
+            subscribers_by_filter.setdefault(subscription[2], []).append(subscription)
+
+        matchers = {filters: self._filter_matcher(json.loads(filters)) for filters in subscribers_by_filter}
+        hits = {filters: [] for filters in subscribers_by_filter}
+
+        for change_type, records in delta.items():
+            for record in records:
+                record_location_keys = self._location_keys(record)
+                for filters, matches in matchers.items():
+                    if matches(change_type, record, record_location_keys):
+                        hits[filters].append({'type': change_type, 'internship': record})
+
+        matched = {}
+        for filters, changes in hits.items():
+            if not changes:
+                continue
+            for subscription_id, user_id, _, webhook_url in subscribers_by_filter[filters]:
+                matched[subscription_id] = {'user_id': user_id, 'webhook_url': webhook_url, 'changes': changes}
+        return matched
+
+    def notify(self, run_at: str, delta: Dict[str, List[Dict]]) -> int:
+        """Queue one webhook per matching subscription; returns how many were queued"""
+        queued = 0
+        for subscription_id, match in self.match_subscriptions(delta).items():
+            if not match['webhook_url']:
+                continue
+            self.dispatcher.submit(match['webhook_url'], {
+                'subscription_id': subscription_id,
+                'user_id': match['user_id'],
+                'run_at': run_at,
+                'changes': match['changes']
+            })
+            queued += 1
+
+        if queued:
+            print(f"Queued {queued} webhook notifications")
+        return queued
+
+    def close(self):
+        """Wait for pending webhook deliveries, e.g. before a one-shot run exits"""
+        if self._dispatcher is not None:
+            self._dispatcher.drain()
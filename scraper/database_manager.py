@@ -1,9 +1,12 @@
 import os
 from supabase import create_client, Client
 import hashlib
+import json
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from pathlib import Path
+from postgrest.exceptions import APIError
+from location_normalizer import expand_location_query
 
 # Load environment variables from .env file
 def load_env_file():
@@ -18,6 +21,12 @@ def load_env_file():
 # Load environment variables
 load_env_file()
 
+# Fields covered by content_hash; a change here bumps updated_at (see migrations/)
+CONTENT_FIELDS = [
+    'category', 'date_posted', 'requires_citizenship', 'no_sponsorship',
+    'is_subsidiary', 'is_freshman_friendly'
+]
+
 class DatabaseManager:
     def __init__(self):
         # Debug environment variables
@@ -38,21 +47,36 @@ class DatabaseManager:
         # Initialize Supabase client
         self.supabase: Client = create_client(supabase_url, supabase_key)
         
+        # Cleared when the change tracking migration hasn't been applied
+        self._change_tracking = True
+        
     def generate_record_hash(self, internship: Dict) -> str:
         """
         Create a more stable hash for each internship record.
         Includes company, role, sorted locations, and application link.
+        Uses the raw README locations when present, so canonicalizing
+        `locations` doesn't change ids that user_saved_internships points at.
         """
-        loc_str = "|".join(sorted([loc.strip().lower() for loc in internship['locations']]))
+        locations = internship.get('raw_locations') or internship['locations']
+        loc_str = "|".join(sorted([loc.strip().lower() for loc in locations]))
         link = internship['application_link'] or ""
         unique_string = f"{internship['company'].strip().lower()}-{internship['role'].strip().lower()}-{loc_str}-{link.strip().lower()}"
         return hashlib.md5(unique_string.encode()).hexdigest()
 
+    def generate_content_hash(self, internship: Dict) -> str:
+        """
+        Hash of the fields outside the record hash, so a changed posting
+        (e.g. sponsorship or freshman-friendly flipped) can be told apart
+        from one that was merely seen again.
+        """
+        tracked = {field: internship.get(field) for field in CONTENT_FIELDS}
+        return hashlib.md5(json.dumps(tracked, sort_keys=True).encode()).hexdigest()
+
     
-    def prepare_records(self, internships: List[Dict]) -> List[Dict]:
+    def prepare_records(self, internships: List[Dict], current_time: str = None) -> List[Dict]:
         """Prepare records with hashes and timestamps"""
         prepared = []
-        current_time = datetime.now().isoformat()
+        current_time = current_time or datetime.now().isoformat()
         
         for internship in internships:
             record = {
@@ -68,6 +92,7 @@ class DatabaseManager:
                 'is_subsidiary': internship['is_subsidiary'],
                 'is_freshman_friendly': internship.get('is_freshman_friendly', False),  # New field
                 'last_seen': current_time,
+                'content_hash': self.generate_content_hash(internship),
                 'is_active': True
             }
             prepared.append(record)
@@ -85,10 +110,10 @@ class DatabaseManager:
                 deduped.append(internship)
         return deduped
 
-    def prepare_records(self, internships: List[Dict]) -> List[Dict]:
+    def prepare_records(self, internships: List[Dict], current_time: str = None) -> List[Dict]:
         """Prepare records with hashes and timestamps"""
         prepared = []
-        current_time = datetime.now().isoformat()
+        current_time = current_time or datetime.now().isoformat()
         
         for internship in internships:
             record = {
@@ -104,29 +129,39 @@ class DatabaseManager:
                 'is_subsidiary': internship['is_subsidiary'],
                 'is_freshman_friendly': internship.get('is_freshman_friendly', False),
                 'last_seen': current_time,  # <-- updated here
+                'content_hash': self.generate_content_hash(internship),
                 'is_active': True
             }
             prepared.append(record)
         
         return prepared
 
-    def bulk_upsert_internships(self, internships: List[Dict]) -> bool:
+    def bulk_upsert_internships(self, internships: List[Dict], current_time: str = None) -> bool:
         """
         Efficient bulk upsert using Supabase's upsert functionality.
-        Automatically updates last_seen for stale detection.
+        Automatically updates last_seen for stale detection; pass the run's
+        `current_time` so mark_stale_records can use the same cutoff.
+        updated_at is maintained by the trigger in
+        migrations/001_internships_change_tracking.sql from content_hash.
         """
         try:
             print(f"Bulk upserting {len(internships)} internships...")
             internships = self.deduplicate_internships(internships)
             print(f"After deduplication: {len(internships)} unique internships")
             
-            prepared_records = self.prepare_records(internships)
+            prepared_records = self.prepare_records(internships, current_time)
             
             # Bulk upsert - insert or update automatically on primary key
-            result = self.supabase.table('internships').upsert(
-                prepared_records,
-                on_conflict='id'
-            ).execute()
+            try:
+                self._upsert(prepared_records)
+            except APIError as e:
+                # PGRST204: content_hash column missing, migration not applied yet
+                if e.code != 'PGRST204' or not self._change_tracking:
+                    raise
+                print("content_hash column not found, upserting without change tracking "
+                      "(apply scraper/migrations/001_internships_change_tracking.sql)")
+                self._change_tracking = False
+                self._upsert(prepared_records)
             
             print(f"Bulk upserted {len(prepared_records)} records")
             return True
@@ -135,15 +170,27 @@ class DatabaseManager:
             print(f"Bulk upsert error: {e}")
             return False
 
+    def _upsert(self, records: List[Dict]):
+        if not self._change_tracking:
+            records = [{key: value for key, value in record.items() if key != 'content_hash'}
+                       for record in records]
+        self.supabase.table('internships').upsert(
+            records,
+            on_conflict='id'
+        ).execute()
     
-    def mark_stale_records(self) -> bool:
-        """Mark records as inactive if they were not updated in the current scrape"""
+    def mark_stale_records(self, seen_at: str) -> bool:
+        """
+        Mark records as inactive if they were not updated in the current scrape.
+        `seen_at` must be the last_seen value the upsert just wrote, otherwise
+        the rows from this run would be older than the cutoff too.
+        """
         try:
             current_time = datetime.now().isoformat()
             result = self.supabase.table('internships').update({
                 'is_active': False,
                 'marked_inactive_at': current_time
-            }).lt('last_seen', current_time).execute()
+            }).eq('is_active', True).lt('last_seen', seen_at).execute()
 
             print("Marked stale records as inactive")
             return True
@@ -152,28 +199,44 @@ class DatabaseManager:
             print(f"Error marking stale records: {e}")
             return False
     
+    def _apply_filters(self, query, filters: Dict = None):
+        """Apply the shared dashboard filters to a query"""
+        if filters:
+            if filters.get('category') and filters['category'] != 'All':
+                query = query.eq('category', filters['category'])
+            
+            if filters.get('no_citizenship_required'):
+                query = query.eq('requires_citizenship', False)
+            
+            if filters.get('sponsorship_available'):
+                query = query.eq('no_sponsorship', False)
+            
+            if filters.get('freshman_friendly'):
+                query = query.eq('is_freshman_friendly', True)
+            
+            if filters.get('location'):
+                # Locations are canonicalized at parse time, so expand the query
+                # ("Bay Area", "remote or GA") to canonical names and overlap
+                names = expand_location_query(filters['location']) or [filters['location']]
+                query = self._match_any_location(query, names)
+        
+        return query
+    
+    def _match_any_location(self, query, names: List[str]):
+        """Rows whose locations (text[]) contain at least one of `names`"""
+        def quote(value: str) -> str:
+            # Values contain commas ("San Francisco, CA"), so always double-quote
+            return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+        
+        return query.filter('locations', 'ov', '{' + ','.join(quote(name) for name in names) + '}')
+    
     def get_active_internships(self, filters: Dict = None) -> List[Dict]:
         """Get active internships with optional filters (single query)"""
         try:
             query = self.supabase.table('internships').select('*').eq('is_active', True)
             
             # Apply filters efficiently in single query
-            if filters:
-                if filters.get('category') and filters['category'] != 'All':
-                    query = query.eq('category', filters['category'])
-                
-                if filters.get('no_citizenship_required'):
-                    query = query.eq('requires_citizenship', False)
-                
-                if filters.get('sponsorship_available'):
-                    query = query.eq('no_sponsorship', False)
-                
-                if filters.get('freshman_friendly'):
-                    query = query.eq('is_freshman_friendly', True)
-                
-                if filters.get('location'):
-                    # Use PostgreSQL JSON operators for location search
-                    query = query.contains('locations', [filters['location']])
+            query = self._apply_filters(query, filters)
             
             result = query.execute()
             return result.data
@@ -182,6 +245,73 @@ class DatabaseManager:
             print(f"Error fetching internships: {e}")
             return []
     
+    def fetch_internships_page(self, columns: List[str] = None, filters: Dict = None,
+                               changed_since=None, after_id: str = None,
+                               page_size: int = 500, active_only: bool = True) -> List[Dict]:
+        """
+        Fetch one keyset page ordered by id, which never changes for a row,
+        so a scrape running mid-stream can't move rows past the cursor.
+        `after_id` is the id of the last row of the previous page.
+        The server may return fewer than `page_size` rows (db-max-rows).
+        
+        With `changed_since`, returns rows whose content changed (updated_at)
+        or that were closed (marked_inactive_at) after that time, including
+        inactive ones so consumers see removals; `active_only` is ignored.
+        Needs migrations/001_internships_change_tracking.sql. updated_at is
+        database time, so pass a time taken from the rows (e.g. the largest
+        updated_at seen) rather than the local clock.
+        """
+        selected = list(columns) if columns else ['*']
+        if '*' not in selected:
+            required = ['id', 'is_active'] if changed_since else ['id']
+            for key in required:
+                if key not in selected:
+                    selected.append(key)
+        
+        query = self.supabase.table('internships').select(','.join(selected))
+        
+        if changed_since:
+            if isinstance(changed_since, datetime):
+                changed_since = changed_since.isoformat()
+            query = query.or_(f'updated_at.gt."{changed_since}",marked_inactive_at.gt."{changed_since}"')
+        elif active_only:
+            query = query.eq('is_active', True)
+        
+        query = self._apply_filters(query, filters)
+        
+        if after_id:
+            query = query.gt('id', after_id)
+        
+        result = query.order('id').limit(page_size).execute()
+        return result.data
+    
+    def iter_active_internships(self, columns: List[str] = None, filters: Dict = None,
+                                changed_since=None, page_size: int = 500,
+                                active_only: bool = True) -> Iterator[Dict]:
+        """
+        Stream internships page by page instead of loading the whole table.
+        Pass `changed_since` (datetime or ISO string), e.g. the largest
+        updated_at / marked_inactive_at of the previous read, to only get rows
+        added, changed or closed since.
+        Errors are raised rather than ending the stream early, so a partial
+        read can't be mistaken for a complete one.
+        """
+        if page_size <= 0:
+            raise ValueError(f"page_size must be positive, got {page_size}")
+        
+        after_id = None
+        while True:
+            rows = self.fetch_internships_page(columns, filters, changed_since, after_id,
+                                               page_size, active_only)
+            
+            # A short page doesn't mean the end: the server may cap page_size
+            # (db-max-rows), so only an empty page does
+            if not rows:
+                return
+            
+            yield from rows
+            after_id = rows[-1]['id']
+    
     def get_stats(self) -> Dict:
         """Get aggregated stats with efficient SQL"""
         try:
@@ -250,6 +380,7 @@ class DatabaseManager:
 
 # Enhanced scraper with database integration
 from internship_scraper import OptimizedInternshipScraper
+from change_feed import ChangeFeed
 
 class InternshipScraperWithDB(OptimizedInternshipScraper):
     """Enhanced scraper with efficient database integration"""
@@ -257,6 +388,20 @@ class InternshipScraperWithDB(OptimizedInternshipScraper):
     def __init__(self):
         super().__init__()
         self.db = DatabaseManager()
+        self._change_feed = None
+    
+    @property
+    def change_feed(self) -> ChangeFeed:
+        """Opened (and its SQLite file created) on first use rather than on construction"""
+        if self._change_feed is None:
+            self._change_feed = ChangeFeed(identity=self.db.generate_record_hash,
+                                           fingerprint=self.db.generate_content_hash)
+        return self._change_feed
+    
+    def close(self):
+        """Wait for pending change feed webhooks, e.g. before a one-shot run exits"""
+        if self._change_feed is not None:
+            self._change_feed.close()
     
     def sync_to_database(self, internships: List[Dict]) -> bool:
         """Efficiently sync scraped data to database"""
@@ -265,16 +410,56 @@ class InternshipScraperWithDB(OptimizedInternshipScraper):
         
         print(f"Syncing {len(internships)} internships to database...")
         
+        # One timestamp for the whole run, shared by upsert and stale detection
+        run_time = datetime.now().isoformat()
+        
         # 1. Bulk upsert all current records (single operation)
-        success = self.db.bulk_upsert_internships(internships)
+        success = self.db.bulk_upsert_internships(internships, run_time)
         
         if success:
-            # 2. Mark records not in current batch as inactive (single operation)
-            current_hashes = [self.db.generate_record_hash(i) for i in internships]
-            self.db.mark_stale_records(current_hashes)
+            # 2. Mark records not stamped by this run as inactive (single operation)
+            self.db.mark_stale_records(run_time)
         
         return success
     
+    def compute_changes(self, internships: List[Dict]) -> Dict:
+        """Diff this run against the change feed snapshot without committing it"""
+        try:
+            return self.change_feed.compute_delta(internships)
+        except Exception as e:
+            print(f"Change feed error: {e}")
+            return None
+    
+    def commit_changes(self, delta: Dict) -> Dict:
+        """Append a computed delta to the change feed and notify subscribers"""
+        if delta is None:
+            return None
+        try:
+            return self.change_feed.commit(delta)
+        except Exception as e:
+            print(f"Change feed error: {e}")
+            return None
+    
+    def publish_changes(self, internships: List[Dict]) -> Dict:
+        """Append this run's new/closed/changed set to the change feed"""
+        return self.commit_changes(self.compute_changes(internships))
+    
+    def completion_stats(self, internships: List[Dict], delta: Dict = None) -> Dict:
+        """scrape_logs counters, taken from the change feed delta when available"""
+        if delta is None:
+            return {
+                'total_found': len(internships),
+                'new_added': len(internships),  # No delta to compare against
+                'updated': 0,
+                'marked_inactive': 0
+            }
+        return {
+            'total_found': len(internships),
+            'new_added': len(delta['new']),
+            'updated': len(delta['changed']),
+            'marked_inactive': len(delta['closed'])
+        }
+    
     def scrape_and_sync(self):
         """Main method: scrape and sync to database efficiently"""
         log_id = None
@@ -290,6 +475,9 @@ class InternshipScraperWithDB(OptimizedInternshipScraper):
                 success = self.sync_to_database(internships)
                 
                 if success:
+                    # Publish new/closed/changed postings
+                    delta = self.publish_changes(internships)
+                    
                     # Export JSON backup
                     self.export_json()
                     
@@ -300,12 +488,7 @@ class InternshipScraperWithDB(OptimizedInternshipScraper):
                     
                     # Log completion
                     if log_id:
-                        self.db.log_scrape_completion(log_id, {
-                            'total_found': len(internships),
-                            'new_added': len(internships),  # Simplified for now
-                            'updated': 0,
-                            'marked_inactive': 0
-                        })
+                        self.db.log_scrape_completion(log_id, self.completion_stats(internships, delta))
                     
                 return success
             else:
@@ -330,6 +513,7 @@ if __name__ == "__main__":
     
     # One-time sync
     scraper.scrape_and_sync()
+    scraper.close()
     
     # Get filtered data from database
     ai_jobs = scraper.db.get_active_internships({'category': 'AI/ML'})
@@ -1,14 +1,18 @@
+import os
 import requests
 import re
 import json
 import schedule
 import time
 from datetime import datetime
+from location_normalizer import canonical_locations, LocationIndex
+from binary_snapshot import write_snapshot
 
 class OptimizedInternshipScraper:
     def __init__(self):
         self.base_url = "https://raw.githubusercontent.com/vanshb03/Summer2026-Internships/main/README.md"
         self.internships = []
+        self._location_index = None
         
         # Role categorization keywords
         self.role_categories = {
@@ -93,7 +97,12 @@ class OptimizedInternshipScraper:
         return href_match.group(1) if href_match else None
     
     def parse_location(self, location_text):
-        """Parse location handling <br> tags and details"""
+        """Parse location handling <br> tags and details, canonicalizing each entry"""
+        # Expands <details> cells instead of collapsing them to "N locations"
+        return canonical_locations(location_text)
+    
+    def parse_raw_locations(self, location_text):
+        """Location cell as originally split, kept so record ids don't depend on canonicalization"""
         # Handle details/summary for multiple locations
         if '<details>' in location_text:
             summary_match = re.search(r'<summary>\*\*(\d+)\s+locations?\*\*</summary>', location_text)
@@ -176,6 +185,7 @@ class OptimizedInternshipScraper:
         
         current_company = None
         self.internships = []
+        self._location_index = None
         
         # Process each line after table start
         for line in lines[table_start:]:
@@ -226,6 +236,7 @@ class OptimizedInternshipScraper:
                 'role': role,
                 'category': self.categorize_role(role),
                 'locations': locations,
+                'raw_locations': self.parse_raw_locations(location),
                 'application_link': app_link,
                 'date_posted': date_posted,
                 'requires_citizenship': requirements['requires_citizenship'],
@@ -256,7 +267,7 @@ class OptimizedInternshipScraper:
         return internships
     
     def export_json(self, filename='internships.json'):
-        """Export to JSON"""
+        """Export to JSON, plus a binary snapshot (internships.bin) for fast cold loads"""
         data = {
             'last_updated': datetime.now().isoformat(),
             'total_count': len(self.internships),
@@ -267,19 +278,34 @@ class OptimizedInternshipScraper:
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
         
-        print(f"Exported to {filename}")
+        snapshot_filename = os.path.splitext(filename)[0] + '.bin'
+        write_snapshot(data, snapshot_filename)
+        
+        print(f"Exported to {filename} and {snapshot_filename}")
+    
+    @property
+    def location_index(self):
+        """City/state/metro/remote index over the current internships, built on first use"""
+        if self._location_index is None:
+            self._location_index = LocationIndex(self.internships)
+        return self._location_index
     
     def get_filtered_data(self, category=None, location=None, sponsorship_ok=None, freshman_friendly=None):
         """Get filtered internships for frontend"""
         filtered = self.internships
         
+        if location and location != 'All':
+            # "Bay Area", "remote or GA", "SF" resolve through the index
+            positions = self.location_index.query(location)
+            if positions is not None:
+                filtered = [self.internships[p] for p in sorted(positions)]
+            else:
+                filtered = [i for i in filtered if any(location.lower() in loc.lower() 
+                           for loc in i['locations'])]
+        
         if category and category != 'All':
             filtered = [i for i in filtered if i['category'] == category]
         
-        if location and location != 'All':
-            filtered = [i for i in filtered if any(location.lower() in loc.lower() 
-                       for loc in i['locations'])]
-        
         if sponsorship_ok is not None:
             if sponsorship_ok:
                 filtered = [i for i in filtered if not i['no_sponsorship']]
@@ -0,0 +1,506 @@
+import re
+from typing import List, Dict, Optional, Iterable
+
+# US state abbreviations -> full names
+US_STATES = {
+    'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas', 'CA': 'California',
+    'CO': 'Colorado', 'CT': 'Connecticut', 'DE': 'Delaware', 'DC': 'District of Columbia',
+    'FL': 'Florida', 'GA': 'Georgia', 'HI': 'Hawaii', 'ID': 'Idaho', 'IL': 'Illinois',
+    'IN': 'Indiana', 'IA': 'Iowa', 'KS': 'Kansas', 'KY': 'Kentucky', 'LA': 'Louisiana',
+    'ME': 'Maine', 'MD': 'Maryland', 'MA': 'Massachusetts', 'MI': 'Michigan', 'MN': 'Minnesota',
+    'MS': 'Mississippi', 'MO': 'Missouri', 'MT': 'Montana', 'NE': 'Nebraska', 'NV': 'Nevada',
+    'NH': 'New Hampshire', 'NJ': 'New Jersey', 'NM': 'New Mexico', 'NY': 'New York',
+    'NC': 'North Carolina', 'ND': 'North Dakota', 'OH': 'Ohio', 'OK': 'Oklahoma', 'OR': 'Oregon',
+    'PA': 'Pennsylvania', 'RI': 'Rhode Island', 'SC': 'South Carolina', 'SD': 'South Dakota',
+    'TN': 'Tennessee', 'TX': 'Texas', 'UT': 'Utah', 'VT': 'Vermont', 'VA': 'Virginia',
+    'WA': 'Washington', 'WV': 'West Virginia', 'WI': 'Wisconsin', 'WY': 'Wyoming', 'PR': 'Puerto Rico'
+}
+
+# Spellings seen in the README -> canonical country name
+COUNTRY_ALIASES = {
+    'us': 'US', 'usa': 'US', 'u.s.': 'US', 'u.s.a.': 'US', 'united states': 'US',
+    'united states of america': 'US',
+    'canada': 'Canada',
+    'uk': 'UK', 'united kingdom': 'UK', 'england': 'UK',
+    'india': 'India', 'germany': 'Germany', 'ireland': 'Ireland', 'mexico': 'Mexico',
+    'israel': 'Israel', 'singapore': 'Singapore', 'switzerland': 'Switzerland'
+}
+
+# Compact bundled lookup table: city|state-or-country|metro
+# Covers the cities that show up in the Summer 2026 list plus the usual hubs.
+CITY_TABLE = """
+San Francisco|CA|Bay Area
+South San Francisco|CA|Bay Area
+San Jose|CA|Bay Area
+Santa Clara|CA|Bay Area
+Sunnyvale|CA|Bay Area
+Mountain View|CA|Bay Area
+Palo Alto|CA|Bay Area
+Menlo Park|CA|Bay Area
+Cupertino|CA|Bay Area
+Milpitas|CA|Bay Area
+San Mateo|CA|Bay Area
+Foster City|CA|Bay Area
+Redwood City|CA|Bay Area
+Redwood Shores|CA|Bay Area
+Fremont|CA|Bay Area
+Pleasanton|CA|Bay Area
+Oakland|CA|Bay Area
+Berkeley|CA|Bay Area
+Los Angeles|CA|Los Angeles Area
+Santa Monica|CA|Los Angeles Area
+Long Beach|CA|Los Angeles Area
+Sherman Oaks|CA|Los Angeles Area
+Woodland Hills|CA|Los Angeles Area
+Irvine|CA|Los Angeles Area
+El Segundo|CA|Los Angeles Area
+San Diego|CA|San Diego Area
+Roseville|CA|Sacramento Area
+New York|NY|New York City Area
+Long Island|NY|New York City Area
+North Hills|NY|New York City Area
+Purchase|NY|New York City Area
+Holtsville|NY|New York City Area
+Jersey City|NJ|New York City Area
+Hoboken|NJ|New York City Area
+Weehawken|NJ|New York City Area
+Newark|NJ|New York City Area
+Woodbridge|NJ|New York City Area
+Berkeley Heights|NJ|New York City Area
+Greenwich|CT|New York City Area
+Stamford|CT|New York City Area
+Buffalo|NY|
+North Haven|CT|
+Seattle|WA|Seattle Area
+Redmond|WA|Seattle Area
+Bellevue|WA|Seattle Area
+Kirkland|WA|Seattle Area
+Chicago|IL|Chicago Area
+Schaumburg|IL|Chicago Area
+Lincolnshire|IL|Chicago Area
+Champaign|IL|
+Austin|TX|Austin Area
+Dallas|TX|Dallas-Fort Worth
+Fort Worth|TX|Dallas-Fort Worth
+Plano|TX|Dallas-Fort Worth
+Richardson|TX|Dallas-Fort Worth
+Irving|TX|Dallas-Fort Worth
+Coppell|TX|Dallas-Fort Worth
+Houston|TX|Houston Area
+Spring|TX|Houston Area
+San Antonio|TX|
+El Paso|TX|
+Atlanta|GA|Atlanta Area
+Alpharetta|GA|Atlanta Area
+Marietta|GA|Atlanta Area
+Sandy Springs|GA|Atlanta Area
+Duluth|GA|Atlanta Area
+Norcross|GA|Atlanta Area
+Suwanee|GA|Atlanta Area
+Boston|MA|Boston Area
+Cambridge|MA|Boston Area
+Waltham|MA|Boston Area
+Watertown|MA|Boston Area
+Needham|MA|Boston Area
+Natick|MA|Boston Area
+Framingham|MA|Boston Area
+Lowell|MA|Boston Area
+Worcester|MA|
+Washington|DC|DC Area
+McLean|VA|DC Area
+Reston|VA|DC Area
+Herndon|VA|DC Area
+Fairfax|VA|DC Area
+Arlington|VA|DC Area
+Alexandria|VA|DC Area
+Gaithersburg|MD|DC Area
+College Park|MD|DC Area
+Bethesda|MD|DC Area
+Richmond|VA|
+Blacksburg|VA|
+Philadelphia|PA|Philadelphia Area
+Bala Cynwyd|PA|Philadelphia Area
+Malvern|PA|Philadelphia Area
+Pittsburgh|PA|
+Raleigh|NC|Research Triangle
+Durham|NC|Research Triangle
+Cary|NC|Research Triangle
+Research Triangle Park|NC|Research Triangle
+Charlotte|NC|
+Greensboro|NC|
+Minneapolis|MN|Twin Cities
+St. Paul|MN|Twin Cities
+Bloomington|MN|Twin Cities
+Hopkins|MN|Twin Cities
+Shakopee|MN|Twin Cities
+Austin|MN|
+Dodge Center|MN|
+Miami|FL|Miami Area
+Fort Lauderdale|FL|Miami Area
+Sunrise|FL|Miami Area
+Tampa|FL|
+Orlando|FL|
+Fort Myers|FL|
+Denver|CO|Denver Area
+Boulder|CO|Denver Area
+Centennial|CO|Denver Area
+Lafayette|CO|Denver Area
+Colorado Springs|CO|
+Kansas City|MO|Kansas City Area
+Overland Park|KS|Kansas City Area
+Olathe|KS|Kansas City Area
+St. Louis|MO|St. Louis Area
+Maryland Heights|MO|St. Louis Area
+Bridgeton|MO|St. Louis Area
+Ann Arbor|MI|Detroit Area
+Troy|MI|Detroit Area
+Detroit|MI|Detroit Area
+Nashville|TN|Nashville Area
+Hermitage|TN|Nashville Area
+Memphis|TN|
+Chattanooga|TN|
+Phoenix|AZ|Phoenix Area
+Columbus|OH|Columbus Area
+Delaware|OH|Columbus Area
+Indianapolis|IN|
+West Lafayette|IN|
+Milwaukee|WI|Milwaukee Area
+Wauwatosa|WI|Milwaukee Area
+Pleasant Prairie|WI|Milwaukee Area
+Middleton|WI|
+Neenah|WI|
+Oshkosh|WI|
+Green Bay|WI|
+Greenville|WI|
+Cedar Rapids|IA|
+Cedar Falls|IA|
+Ames|IA|
+Pella|IA|
+Clear Lake|IA|
+Bentonville|AR|
+Fort Smith|AR|
+Huntsville|AL|
+Columbus|MS|
+Oklahoma City|OK|
+Dakota Dunes|SD|
+Portland|OR|
+Salt Lake City|UT|
+Toronto|Canada|Toronto Area
+Waterloo|Canada|
+Montreal|Canada|
+Vancouver|Canada|
+"""
+
+# Common shorthand -> (city, state)
+# A bare "LA" location is read as Los Angeles; as a query it matches both
+# Los Angeles and Louisiana (see resolve_location_query).
+CITY_ALIASES = {
+    'sf': ('San Francisco', 'CA'),
+    'nyc': ('New York', 'NY'),
+    'new york city': ('New York', 'NY'),
+    'manhattan': ('New York', 'NY'),
+    'la': ('Los Angeles', 'CA'),
+    'dc': ('Washington', 'DC'),
+    'washington dc': ('Washington', 'DC'),
+    'washington d.c.': ('Washington', 'DC'),
+    'st paul': ('St. Paul', 'MN'),
+    'saint paul': ('St. Paul', 'MN'),
+    'st louis': ('St. Louis', 'MO'),
+    'saint louis': ('St. Louis', 'MO'),
+    'weekhawken': ('Weehawken', 'NJ'),
+    'urbana champaign': ('Champaign', 'IL'),
+    'urbana-champaign': ('Champaign', 'IL'),
+    'rtp': ('Research Triangle Park', 'NC')
+}
+
+# Extra names people use for the metros in CITY_TABLE
+METRO_ALIASES = {
+    'sf bay area': 'Bay Area',
+    'san francisco bay area': 'Bay Area',
+    'silicon valley': 'Bay Area',
+    'nyc area': 'New York City Area',
+    'new york area': 'New York City Area',
+    'tri-state area': 'New York City Area',
+    'dmv': 'DC Area',
+    'washington dc area': 'DC Area',
+    'dfw': 'Dallas-Fort Worth',
+    'triangle': 'Research Triangle',
+    'socal': 'Los Angeles Area'
+}
+
+
+def _load_city_table(table: str):
+    """Parse CITY_TABLE into (city, region) -> metro and the reverse metro/state lists"""
+    metro_of = {}
+    cities_by_metro = {}
+    cities_by_state = {}
+    for line in table.strip().splitlines():
+        city, region, metro = line.split('|')
+        metro_of[(city.lower(), region)] = metro or None
+        if metro:
+            cities_by_metro.setdefault(metro, []).append((city, region))
+        cities_by_state.setdefault(region, []).append((city, region))
+    return metro_of, cities_by_metro, cities_by_state
+
+
+_METRO_OF, _CITIES_BY_METRO, _CITIES_BY_STATE = _load_city_table(CITY_TABLE)
+_METRO_NAMES = {metro.lower(): metro for metro in _CITIES_BY_METRO}
+_METRO_NAMES.update(METRO_ALIASES)
+_STATE_NAMES = {name.lower(): abbr for abbr, name in US_STATES.items()}
+
+# Bare city names that only appear once in the table ("Seattle" -> Seattle, WA)
+_city_regions = {}
+for _city, _region in _METRO_OF:
+    _city_regions.setdefault(_city, []).append(_region)
+_UNIQUE_CITIES = {city: regions[0] for city, regions in _city_regions.items() if len(regions) == 1}
+_CITY_SPELLING = {city.lower(): city for cities in _CITIES_BY_STATE.values() for city, _ in cities}
+
+
+def _normalize_region(region: str) -> Dict:
+    """Resolve the part after the comma to a US state or a country"""
+    key = region.strip().lower()
+    if key.upper() in US_STATES:
+        return {'state': key.upper(), 'country': 'US'}
+    if key in ('d.c.', 'd.c', 'd. c.'):
+        return {'state': 'DC', 'country': 'US'}
+    if key in _STATE_NAMES:
+        return {'state': _STATE_NAMES[key], 'country': 'US'}
+    if key in COUNTRY_ALIASES:
+        return {'state': None, 'country': COUNTRY_ALIASES[key]}
+    return {'state': None, 'country': None}
+
+
+def _display(city: Optional[str], state: Optional[str], country: Optional[str], remote: bool) -> Optional[str]:
+    """Canonical display string stored in the `locations` array"""
+    if remote:
+        if state:
+            return f"Remote in {state}"
+        return f"Remote in {country}" if country else "Remote"
+    if city and state:
+        return f"{city}, {state}"
+    if city and country:
+        return f"{city}, {country}"
+    if state:
+        return US_STATES[state]
+    if country:
+        return 'United States' if country == 'US' else country
+    return city
+
+
+def normalize_location(raw: str) -> Dict:
+    """
+    Canonicalize a single location string.
+    Returns city/state/country/metro/remote plus the canonical display string;
+    anything unrecognised keeps its cleaned raw text as the display string.
+    """
+    text = re.sub(r'<[^>]+>', ' ', raw or '')
+    text = ' '.join(text.split()).strip(' ,;')
+    low = text.lower()
+
+    location = {'raw': raw, 'city': None, 'state': None, 'country': None, 'metro': None, 'remote': False}
+
+    if re.search(r'\bremote\b', low):
+        location['remote'] = True
+        # "Remote in USA", "Remote - IN", "USA (Remote)"
+        before, after = re.split(r'\bremote\b', low, maxsplit=1)
+        after = re.sub(r'^[\s()\-–,:]+', '', after).rstrip(' )')
+        after = re.sub(r'^in\s+(?=\S)', '', after)
+        rest = after or before.strip(' ()-–,:/')
+        if rest in COUNTRY_ALIASES:
+            location['country'] = COUNTRY_ALIASES[rest]
+        elif rest.upper() in US_STATES or rest in _STATE_NAMES:
+            location['state'] = rest.upper() if rest.upper() in US_STATES else _STATE_NAMES[rest]
+            location['country'] = 'US'
+        elif rest:
+            # Qualifier we can't resolve; keep it rather than dropping it
+            location['display'] = text
+            return location
+        location['display'] = _display(None, location['state'], location['country'], True)
+        return location
+
+    if low in COUNTRY_ALIASES:
+        location['country'] = COUNTRY_ALIASES[low]
+        location['display'] = _display(None, None, location['country'], False)
+        return location
+
+    city, region = None, {'state': None, 'country': None}
+    if low in CITY_ALIASES:
+        city, state = CITY_ALIASES[low]
+        region = {'state': state, 'country': 'US'}
+    elif ',' in text:
+        city_part, region_part = text.rsplit(',', 1)
+        region = _normalize_region(region_part)
+        city_key = city_part.strip().lower()
+        if not region['state'] and not region['country']:
+            # Unknown region ("Toronto, ON", "Paris, France"): keep the text as-is
+            location['city'] = city_part.strip()
+            location['display'] = text
+            return location
+        if city_key in CITY_ALIASES:
+            city = CITY_ALIASES[city_key][0]
+        else:
+            city = _CITY_SPELLING.get(city_key, city_part.strip())
+    elif (low in _STATE_NAMES and low != 'new york') or (len(low) == 2 and low.upper() in US_STATES):
+        # Bare state ("Georgia", "Washington", "TX"); "New York" stays the city
+        # as in resolve_location_query
+        location['state'] = _STATE_NAMES.get(low, low.upper())
+        location['country'] = 'US'
+        location['display'] = _display(None, location['state'], 'US', False)
+        return location
+    elif low in _UNIQUE_CITIES:
+        city = _CITY_SPELLING[low]
+        state = _UNIQUE_CITIES[low]
+        region = {'state': state, 'country': 'US'} if state in US_STATES else {'state': None, 'country': state}
+    else:
+        location['display'] = text
+        return location
+
+    location['city'] = city
+    location['state'] = region['state']
+    location['country'] = region['country']
+    location['metro'] = _METRO_OF.get((city.lower(), region['state'] or region['country']))
+    location['display'] = _display(city, region['state'], region['country'], False)
+    return location
+
+
+def expand_location_cell(cell: str) -> List[str]:
+    """
+    Split a README location cell into individual locations.
+    Handles <br> separated cells and <details><summary>**N locations**</summary>...</details>.
+    """
+    if '<details>' in cell:
+        content = re.search(r'</summary>(.*?)(?:</details>|$)', cell, re.S)
+        cell = content.group(1) if content else ''
+    parts = re.split(r'</?br\s*/?>', cell)
+    return [part.strip() for part in parts if part.strip()]
+
+
+def canonical_locations(cell: str) -> List[str]:
+    """Expand a location cell and return de-duplicated canonical display strings"""
+    seen = set()
+    locations = []
+    for part in expand_location_cell(cell):
+        display = normalize_location(part)['display']
+        if display and display not in seen:
+            seen.add(display)
+            locations.append(display)
+    return locations
+
+
+def resolve_location_query(query: str) -> Optional[List[tuple]]:
+    """
+    Turn a free-text filter like "Bay Area", "remote or GA" or "SF" into index keys.
+    Returns None if any term cannot be resolved, so callers can fall back to a scan.
+    """
+    keys = []
+    for term in re.split(r'\s+or\s+|\s*\|\s*|\s*;\s*', query.strip(), flags=re.I):
+        term = term.strip().lower()
+        if term.startswith('all '):
+            term = term[4:]
+        if not term:
+            continue
+
+        if term == 'remote':
+            keys.append(('remote', True))
+        elif term == 'la':
+            # Ambiguous between the city and the state abbreviation
+            keys.append(('city', 'Los Angeles, CA'))
+            keys.append(('state', 'LA'))
+        elif term in _METRO_NAMES:
+            keys.append(('metro', _METRO_NAMES[term]))
+        elif term in CITY_ALIASES or term == 'new york':
+            # "New York" means the city, not the state, in a job search
+            location = normalize_location(term)
+            keys.append(('city', location['display']))
+        elif term.upper() in US_STATES and len(term) == 2:
+            keys.append(('state', term.upper()))
+        elif term in _STATE_NAMES:
+            keys.append(('state', _STATE_NAMES[term]))
+        elif term in COUNTRY_ALIASES:
+            keys.append(('country', COUNTRY_ALIASES[term]))
+        else:
+            location = normalize_location(term)
+            if location['remote']:
+                keys.append(('remote', True))
+            elif location['city']:
+                keys.append(('city', location['display']))
+            else:
+                return None
+    return keys or None
+
+
+def expand_location_query(query: str) -> Optional[List[str]]:
+    """
+    Canonical display strings a query can match, from the bundled table alone.
+    Used for server-side array overlap filters where no local index exists;
+    cities missing from CITY_TABLE will not be matched by a state query.
+    """
+    keys = resolve_location_query(query)
+    if keys is None:
+        return None
+
+    displays = []
+    for kind, value in keys:
+        if kind == 'remote':
+            displays.append('Remote')
+            displays.extend(f"Remote in {country}" for country in sorted(set(COUNTRY_ALIASES.values())))
+            displays.extend(f"Remote in {state}" for state in US_STATES)
+        elif kind == 'metro':
+            displays.extend(_display(city, region, None, False) for city, region in _CITIES_BY_METRO[value])
+        elif kind == 'state':
+            displays.extend(_display(city, region, None, False) for city, region in _CITIES_BY_STATE.get(value, []))
+            displays.append(_display(None, value, 'US', False))
+            displays.append(_display(None, value, 'US', True))
+        elif kind == 'country':
+            displays.append(_display(None, None, value, False))
+        else:
+            displays.append(value)
+    return list(dict.fromkeys(displays))
+
+
+def index_key(key: tuple) -> tuple:
+    """City keys compare case-insensitively; other kinds are already canonical"""
+    kind, value = key
+    return (kind, value.lower()) if kind == 'city' else key
+
+
+def location_keys(display: str) -> set:
+    """Index keys (city, state, metro, remote, country) for one stored location"""
+    location = normalize_location(display)
+    keys = set()
+    if location['remote']:
+        keys.add(('remote', True))
+    if location['city']:
+        keys.add(index_key(('city', location['display'])))
+    for kind in ('state', 'metro', 'country'):
+        if location[kind]:
+            keys.add((kind, location[kind]))
+    return keys
+
+
+class LocationIndex:
+    """Inverted index from (city|state|metro|remote|country) keys to internship positions"""
+
+    def __init__(self, internships: Iterable[Dict] = ()):
+        self.index = {}
+        for position, internship in enumerate(internships):
+            self.add(position, internship.get('locations', []))
+
+    def add(self, position: int, locations: List[str]):
+        for display in locations:
+            for key in location_keys(display):
+                self.index.setdefault(key, set()).add(position)
+
+    def lookup(self, keys: List[tuple]) -> set:
+        """Union of positions matching any of the keys"""
+        positions = set()
+        for key in keys:
+            positions |= self.index.get(index_key(key), set())
+        return positions
+
+    def query(self, text: str) -> Optional[set]:
+        """Positions matching a free-text query, or None if it could not be resolved"""
+        keys = resolve_location_query(text)
+        if keys is None:
+            return None
+        return self.lookup(keys)
@@ -0,0 +1,37 @@
+-- Change tracking for internships, used by the Python scraper's
+-- changed_since reads (DatabaseManager.iter_active_internships).
+--
+-- content_hash is written by the scraper on every upsert. updated_at is owned
+-- by the trigger below: it only moves when content_hash changes or a closed
+-- posting comes back, not on every last_seen bump. Don't add another trigger
+-- that touches updated_at on every UPDATE, or every row reads as changed.
+-- marked_inactive_at is stamped here too so both columns use database time.
+--
+-- Safe to run more than once. Until it is applied the scraper upserts without
+-- content_hash and changed_since reads are unavailable.
+
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+
+CREATE INDEX IF NOT EXISTS idx_internships_updated_at ON internships (updated_at);
+CREATE INDEX IF NOT EXISTS idx_internships_marked_inactive_at ON internships (marked_inactive_at);
+
+CREATE OR REPLACE FUNCTION internships_track_changes() RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.content_hash IS DISTINCT FROM OLD.content_hash
+       OR (NEW.is_active AND NOT OLD.is_active) THEN
+        NEW.updated_at := NOW();
+    ELSE
+        NEW.updated_at := OLD.updated_at;
+    END IF;
+    IF OLD.is_active AND NOT NEW.is_active THEN
+        NEW.marked_inactive_at := NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS internships_track_changes ON internships;
+CREATE TRIGGER internships_track_changes
+    BEFORE UPDATE ON internships
+    FOR EACH ROW EXECUTE FUNCTION internships_track_changes();
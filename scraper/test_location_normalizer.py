@@ -0,0 +1,55 @@
+from location_normalizer import normalize_location, resolve_location_query, LocationIndex
+
+# raw README location -> (display, city, state, country)
+NORMALIZE_CASES = [
+    ('Delaware', 'Delaware', None, 'DE', 'US'),
+    ('Delaware, OH', 'Delaware, OH', 'Delaware', 'OH', 'US'),
+    ('Washington', 'Washington', None, 'WA', 'US'),
+    ('Washington, DC', 'Washington, DC', 'Washington', 'DC', 'US'),
+    ('DC', 'Washington, DC', 'Washington', 'DC', 'US'),
+    ('Georgia', 'Georgia', None, 'GA', 'US'),
+    ('California', 'California', None, 'CA', 'US'),
+    ('Texas', 'Texas', None, 'TX', 'US'),
+    ('TX', 'Texas', None, 'TX', 'US'),
+    ('New York', 'New York, NY', 'New York', 'NY', 'US'),
+    ('Seattle', 'Seattle, WA', 'Seattle', 'WA', 'US'),
+    ('SF', 'San Francisco, CA', 'San Francisco', 'CA', 'US'),
+    ('LA', 'Los Angeles, CA', 'Los Angeles', 'CA', 'US'),
+    ('Atlanta, Georgia', 'Atlanta, GA', 'Atlanta', 'GA', 'US'),
+    ('Canada', 'Canada', None, None, 'Canada'),
+    ('United States', 'United States', None, None, 'US'),
+    ('Toronto, ON', 'Toronto, ON', 'Toronto', None, None),
+    ('Remote in GA', 'Remote in GA', None, 'GA', 'US'),
+    ('Remote in USA', 'Remote in US', None, None, 'US'),
+]
+
+# query -> raw locations it must match, and ones it must not
+QUERY_CASES = [
+    ('Washington', ['Washington', 'Seattle, WA', 'Remote in WA'], ['Washington, DC']),
+    ('DC', ['Washington, DC'], ['Washington', 'Seattle, WA']),
+    ('Georgia', ['Georgia', 'Atlanta, GA', 'Remote in Georgia'], ['Delaware']),
+    ('Delaware', ['Delaware'], ['Delaware, OH']),
+    ('Bay Area', ['SF', 'Sunnyvale, CA'], ['California', 'Los Angeles, CA']),
+    ('remote or TX', ['Remote', 'Texas', 'Austin, TX'], ['Austin, MN']),
+]
+
+
+def test_normalize_location():
+    for raw, display, city, state, country in NORMALIZE_CASES:
+        location = normalize_location(raw)
+        assert (location['display'], location['city'], location['state'], location['country']) == \
+            (display, city, state, country), raw
+
+
+def test_location_queries():
+    for query, matching, other in QUERY_CASES:
+        assert resolve_location_query(query) is not None, query
+        locations = matching + other
+        index = LocationIndex([{'locations': [normalize_location(raw)['display']]} for raw in locations])
+        assert index.query(query) == set(range(len(matching))), query
+
+
+if __name__ == "__main__":
+    test_normalize_location()
+    test_location_queries()
+    print("All location normalizer checks passed")